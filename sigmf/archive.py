@@ -6,10 +6,11 @@
 
 """Create and extract SigMF archives."""
 
+import io
 import os
-import shutil
+import posixpath
 import tarfile
-import tempfile
+import time
 
 from .error import SigMFFileError
 
@@ -51,6 +52,8 @@ class SigMFArchive():
                          - archive1.sigmf-meta
                          - archive1.sigmf-data
     """
+    __slots__ = ("sigmffile", "name", "fileobj", "path")
+
     def __init__(self, sigmffile, name=None, fileobj=None):
         self.sigmffile = sigmffile
         self.name = name
@@ -60,34 +63,44 @@ class SigMFArchive():
 
         archive_name = self._get_archive_name()
         sigmf_fileobj = self._get_output_fileobj()
+        # PAX only emits extended headers for members that need them (long or
+        # non-ascii names, non-integer mtimes), so short names stay ustar-sized
         sigmf_archive = tarfile.TarFile(mode="w",
                                         fileobj=sigmf_fileobj,
                                         format=tarfile.PAX_FORMAT)
-        tmpdir = tempfile.mkdtemp()
-        sigmf_md_filename = archive_name + SIGMF_METADATA_EXT
-        sigmf_md_path = os.path.join(tmpdir, sigmf_md_filename)
-        sigmf_data_filename = archive_name + SIGMF_DATASET_EXT
-        sigmf_data_path = os.path.join(tmpdir, sigmf_data_filename)
-
-        with open(sigmf_md_path, "w") as mdfile:
-            self.sigmffile.dump(mdfile, pretty=True)
-
-        shutil.copy(self.sigmffile.data_file, sigmf_data_path)
+        # copy the dataset in 1 MiB chunks instead of tarfile's 16 KiB default
+        # (set as an attribute since the `copybufsize` argument needs python 3.8+)
+        sigmf_archive.copybufsize = 1024 * 1024
+
+        # directory entry for the archive contents
+        dir_info = tarfile.TarInfo(name=archive_name)
+        dir_info.type = tarfile.DIRTYPE
+        dir_info.mode = 0o755  # drwxr-xr-x
+        dir_info.mtime = int(time.time())
+        sigmf_archive.addfile(dir_info)
+
+        # dataset is streamed directly from its source file without an intermediate copy;
+        # it precedes the metadata so the metadata can be updated without rewriting it
+        data_stat = os.stat(self.sigmffile.data_file)
+        data_info = tarfile.TarInfo(name=posixpath.join(archive_name, archive_name + SIGMF_DATASET_EXT))
+        data_info.size = data_stat.st_size
+        data_info.mode = 0o644  # -rw-r--r--
+        data_info.mtime = int(data_stat.st_mtime)
+        with open(self.sigmffile.data_file, "rb") as data_fileobj:
+            sigmf_archive.addfile(data_info, data_fileobj)
+
+        # metadata is serialized in memory rather than through a temporary file
+        md_bytes = self.sigmffile.dumps(pretty=True).encode("utf-8")
+        md_info = tarfile.TarInfo(name=posixpath.join(archive_name, archive_name + SIGMF_METADATA_EXT))
+        md_info.size = len(md_bytes)
+        md_info.mode = 0o644  # -rw-r--r--
+        md_info.mtime = dir_info.mtime
+        sigmf_archive.addfile(md_info, io.BytesIO(md_bytes))
 
-        def chmod(tarinfo):
-            if tarinfo.isdir():
-                tarinfo.mode = 0o755  # dwrxw-rw-r
-            else:
-                tarinfo.mode = 0o644  # -wr-r--r--
-            return tarinfo
-
-        sigmf_archive.add(tmpdir, arcname=archive_name, filter=chmod)
         sigmf_archive.close()
         if not fileobj:
             sigmf_fileobj.close()
 
-        shutil.rmtree(tmpdir)
-
         self.path = sigmf_archive.name
 
     def _check_input(self):
@@ -130,6 +143,8 @@ class SigMFArchive():
     def _get_output_fileobj(self):
         try:
             fileobj = self._get_open_fileobj()
+        except SigMFFileError:
+            raise
         except:
             if self.fileobj:
                 err = "fileobj {!r} is not byte-writable".format(self.fileobj)
@@ -143,8 +158,15 @@ class SigMFArchive():
     def _get_open_fileobj(self):
         if self.fileobj:
             fileobj = self.fileobj
-            fileobj.write(bytes())  # force exception if not byte-writable
+            if not getattr(fileobj, "writable", lambda: True)():
+                # checked without I/O, file objects lacking writable() are trusted
+                raise SigMFFileError("fileobj {!r} is not writable".format(fileobj))
+            mode = getattr(fileobj, "mode", "b")
+            if isinstance(fileobj, io.TextIOBase) or (isinstance(mode, str) and "b" not in mode):
+                # text files report writable() but tarfile can only write bytes to them
+                raise SigMFFileError("fileobj {!r} is not binary".format(fileobj))
         else:
-            fileobj = open(self.name, "wb")
+            # large buffer coalesces tarfile's many small header & block writes
+            fileobj = open(self.name, "wb", buffering=4 * 1024 * 1024)
 
         return fileobj
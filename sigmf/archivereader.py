@@ -6,6 +6,7 @@
 
 """Access SigMF archives without extracting them."""
 
+import logging
 import os
 import shutil
 import tarfile
@@ -17,6 +18,8 @@ from .error import SigMFFileError
 from .sigmffile import SigMFFile
 from .utils import dict_merge
 
+log = logging.getLogger(__name__)
+
 
 class SigMFArchiveReader():
     """Access data within SigMF archive `tar` in-place without extracting.
@@ -26,6 +29,8 @@ class SigMFArchiveReader():
       name      -- path to archive file to access. If file does not exist,
                    or if `name` doesn't end in .sigmf, SigMFFileError is raised.
     """
+    __slots__ = ("name", "sigmffile", "ndim", "shape")
+
     def __init__(self, name=None, skip_checksum=False, map_readonly=True, archive_buffer=None):
         self.name = name
         if self.name is not None:
@@ -33,7 +38,9 @@ class SigMFArchiveReader():
                 err = "archive extension != {}".format(SIGMF_ARCHIVE_EXT)
                 raise SigMFFileError(err)
 
-            tar_obj = tarfile.open(self.name)
+            # archives are never compressed since the dataset is mapped in place, so
+            # open uncompressed instead of letting tarfile probe gzip/bz2/xz first
+            tar_obj = tarfile.open(self.name, mode="r:")
 
         elif archive_buffer is not None:
             tar_obj = tarfile.open(fileobj=archive_buffer, mode='r:')
@@ -44,7 +51,7 @@ class SigMFArchiveReader():
         json_contents = None
         data_offset_size = None
 
-        for memb in tar_obj.getmembers():
+        for memb in tar_obj:
             if memb.isdir():  # memb.type == tarfile.DIRTYPE:
                 # the directory structure will be reflected in the member name
                 continue
@@ -57,16 +64,17 @@ class SigMFArchiveReader():
                         # archive than the metadata, so that updating it (like, adding an annotation)
                         # is fast.
                         pass
-                    with tar_obj.extractfile(memb) as memb_fid:
-                        json_contents = memb_fid.read()
+                    # read the small metadata member directly, bypassing the ExFileObject wrapper
+                    tar_obj.fileobj.seek(memb.offset_data)
+                    json_contents = tar_obj.fileobj.read(memb.size)
 
                 elif memb.name.endswith(SIGMF_DATASET_EXT):
                     data_offset_size = memb.offset_data, memb.size
 
                 else:
-                    print('A regular file', memb.name, 'was found but ignored in the archive')
+                    log.debug("Ignored regular file %s in archive", memb.name)
             else:
-                print('A member of type', memb.type, 'and name', memb.name, 'was found but not handled, just FYI.')
+                log.debug("Unhandled archive member of type %s and name %s", memb.type, memb.name)
 
         if data_offset_size is None:
             raise SigMFFileError('No .sigmf-data file found in archive!')
@@ -6,6 +6,7 @@
 
 '''Schema IO'''
 
+import functools
 import json
 import os
 
@@ -18,9 +19,19 @@ SCHEMA_COLLECTION = 'schema-collection.json'
 def get_schema(version=None, schema_file=SCHEMA_META):
     '''
     Load JSON Schema to for either a `sigmf-meta` or `sigmf-collection`.
+    The loaded schema is cached and shared between callers, do not modify it.
 
     TODO: In the future load specific schema versions.
     '''
+    return _load_schema(schema_file)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_schema(schema_file):
+    '''
+    Load and cache a schema file; keyed on the file only since `version` is
+    unused and may come from (possibly malformed) user metadata.
+    '''
     schema_path = os.path.join(
         utils.get_schema_path(os.path.dirname(utils.__file__)),
         schema_file
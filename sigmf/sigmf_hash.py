@@ -7,26 +7,43 @@
 '''Hashing Functions'''
 
 import hashlib
+import mmap
 import os
 
 
 def calculate_sha512(filename=None, fileobj=None, offset_and_size=None):
     """
-    Return sha512 of file or fileobj.
+    Return sha512 of file or fileobj. The fileobj may also be an in-memory
+    BytesIO or bytes-like object (bytes, bytearray, memoryview, mmap).
     """
     the_hash = hashlib.sha512()
+    if hasattr(fileobj, "getbuffer"):
+        fileobj = fileobj.getbuffer()
+    if isinstance(fileobj, (bytes, bytearray, memoryview, mmap.mmap)):
+        # in-memory buffer, hash it directly rather than copying through read()
+        buffer = memoryview(fileobj)
+        if offset_and_size is not None:
+            buffer = buffer[offset_and_size[0]:offset_and_size[0] + offset_and_size[1]]
+        the_hash.update(buffer)
+        return the_hash.hexdigest()
     if filename is not None:
-        fileobj = open(filename, "rb")
-    if offset_and_size is None:
-        bytes_to_hash = os.path.getsize(filename)
-    else:
-        fileobj.seek(offset_and_size[0])
-        bytes_to_hash = offset_and_size[1]
+        with open(filename, "rb") as handle:
+            if offset_and_size is None and hasattr(hashlib, "file_digest"):
+                # python 3.11+ hashes the whole file in C with the GIL released
+                return hashlib.file_digest(handle, "sha512").hexdigest()
+            if offset_and_size is None:
+                offset_and_size = (0, os.fstat(handle.fileno()).st_size)
+            offset, size = offset_and_size
+            if size > 0:
+                # hash the mapped region with a single update instead of a python read loop
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                    the_hash.update(view[offset:offset + size])
+        return the_hash.hexdigest()
+    fileobj.seek(offset_and_size[0])
+    bytes_to_hash = offset_and_size[1]
     bytes_read = 0
     while bytes_read < bytes_to_hash:
         buff = fileobj.read(min(4096, (bytes_to_hash - bytes_read)))
         the_hash.update(buff)
         bytes_read += len(buff)
-    if filename is not None:
-        fileobj.close()
     return the_hash.hexdigest()
@@ -6,9 +6,10 @@
 
 '''SigMFFile Object'''
 
-import codecs
+import io
 import json
-import tarfile
+import mmap
+import re
 import tempfile
 import warnings
 from collections import OrderedDict
@@ -16,12 +17,39 @@ from os import path
 
 import numpy as np
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from . import __specification__, __version__, schema, sigmf_hash, validate
 from .archive import SIGMF_ARCHIVE_EXT, SIGMF_COLLECTION_EXT, SIGMF_DATASET_EXT, SIGMF_METADATA_EXT, SigMFArchive
 from .error import SigMFAccessError, SigMFFileError
 from .utils import dict_merge
 
 
+# orjson parses integers outside the 64-bit range (19 or more digits) as floats
+_LONG_DIGITS = re.compile(r"\d{19}")
+_LONG_DIGITS_BYTES = re.compile(rb"\d{19}")
+
+
+def _loads(contents):
+    '''
+    Parse JSON metadata from a str or utf-8 encoded bytes.
+    Uses orjson when it is installed, since it parses several times faster.
+    '''
+    if orjson is not None:
+        long_digits = _LONG_DIGITS if isinstance(contents, str) else _LONG_DIGITS_BYTES
+        # leave possibly huge integers to json, which keeps them exact
+        if not long_digits.search(contents):
+            try:
+                return orjson.loads(contents)
+            except orjson.JSONDecodeError:
+                # orjson is stricter than json (e.g. NaN, byte order marks), so fall back
+                pass
+    return json.loads(contents)
+
+
 class SigMFMetafile():
     VALID_KEYS = {}
     def __init__(self):
@@ -150,7 +178,7 @@ class SigMFFile(SigMFMetafile):
     ]
     VALID_KEYS = {GLOBAL_KEY: VALID_GLOBAL_KEYS, CAPTURE_KEY: VALID_CAPTURE_KEYS, ANNOTATION_KEY: VALID_ANNOTATION_KEYS}
 
-    def __init__(self, metadata=None, data_file=None, global_info=None, skip_checksum=False, map_readonly=True):
+    def __init__(self, metadata=None, data_file=None, global_info=None, skip_checksum=False, map_readonly=True, data_buffer=None):
         '''
         API for SigMF I/O
 
@@ -166,9 +194,13 @@ class SigMFFile(SigMFMetafile):
             When True will skip calculating hash on data_file (if present) to check against metadata.
         map_readonly: bool, default True
             Indicates whether assignments on the numpy.memmap are allowed.
+        data_buffer: bytes-like or BytesIO, optional
+            In-memory dataset to use instead of `data_file`.
         '''
         super(SigMFFile, self).__init__()
         self.data_file = None
+        self.data_buffer = None
+        self.offset_and_size = None
         self.sample_count = 0
         self._memmap = None
         self.is_complex_data = False  # numpy.iscomplexobj(self._memmap) is not adequate for fixed-point complex case
@@ -180,11 +212,11 @@ class SigMFFile(SigMFMetafile):
         elif isinstance(metadata, dict):
             self._metadata = metadata
         else:
-            self._metadata = json.loads(metadata)
+            self._metadata = _loads(metadata)
         if global_info is not None:
             self.set_global_info(global_info)
-        if data_file is not None:
-            self.set_data_file(data_file, skip_checksum=skip_checksum, map_readonly=map_readonly)
+        if data_file is not None or data_buffer is not None:
+            self.set_data_file(data_file, data_buffer=data_buffer, skip_checksum=skip_checksum, map_readonly=map_readonly)
 
     def __len__(self):
         return self._memmap.shape[0]
@@ -246,9 +278,12 @@ class SigMFFile(SigMFMetafile):
             # check for any non-zero `header_bytes` fields in captures segments
             if capture.get(self.HEADER_BYTES_KEY, 0):
                 return False
-        if not path.isfile(self.data_file):
+        if self.data_file is None:
+            if self.data_buffer is None:
+                return False
+        elif not path.isfile(self.data_file):
             return False
-        # if we get here, the file exists and is conforming
+        # if we get here, the dataset exists and is conforming
         return True
 
     def get_schema(self):
@@ -366,7 +401,7 @@ class SigMFFile(SigMFMetafile):
 
         end_byte = start_byte
         if index == len(self.get_captures())-1:  # last captures...data is the rest of the file
-            end_byte = path.getsize(self.data_file) - self.get_global_field(self.TRAILING_BYTES_KEY, 0)
+            end_byte = self._get_data_size() - self.get_global_field(self.TRAILING_BYTES_KEY, 0)
         else:
             end_byte += (self.get_capture_start(index+1) - self.get_capture_start(index)) * self.get_sample_size() * self.get_num_channels()
         return (start_byte, end_byte)
@@ -438,12 +473,11 @@ class SigMFFile(SigMFMetafile):
         use 0.
         For complex data, a 'sample' includes both the real and imaginary part.
         """
-        if self.data_file is None:
+        if self.data_file is None and self.data_buffer is None:
             sample_count = self._get_sample_count_from_annotations()
         else:
             header_bytes = sum([c.get(self.HEADER_BYTES_KEY, 0) for c in self.get_captures()])
-            file_size = path.getsize(self.data_file) if self.offset_and_size is None else self.offset_and_size[1]
-            file_data_size = file_size - self.get_global_field(self.TRAILING_BYTES_KEY, 0) - header_bytes  # bytes
+            file_data_size = self._get_data_size() - self.get_global_field(self.TRAILING_BYTES_KEY, 0) - header_bytes  # bytes
             sample_size = self.get_sample_size() # size of a sample in bytes
             num_channels = self.get_num_channels()
             sample_count = file_data_size // sample_size // num_channels
@@ -493,10 +527,32 @@ class SigMFFile(SigMFMetafile):
         self.set_global_field(self.HASH_KEY, new_hash)
         return new_hash
 
+    def _get_data_size(self):
+        """
+        Return the size of the dataset in bytes, limited to the region given by
+        `offset_and_size` (e.g. the data member of an archive) if set.
+        """
+        if self.offset_and_size is not None and self.offset_and_size[1] is not None:
+            return self.offset_and_size[1]
+        offset = 0 if self.offset_and_size is None else self.offset_and_size[0]
+        if self.data_file is not None:
+            return path.getsize(self.data_file) - offset
+        return self._get_data_buffer().nbytes - offset
+
+    def _get_data_buffer(self):
+        """
+        Return a memoryview of `data_buffer`, which may be a BytesIO or any
+        bytes-like object (bytes, bytearray, mmap, ...).
+        """
+        if hasattr(self.data_buffer, "getbuffer"):
+            return self.data_buffer.getbuffer()
+        return memoryview(self.data_buffer)
+
     def set_data_file(self, data_file=None, data_buffer=None, skip_checksum=False, offset=0, size_bytes=None, map_readonly=True):
         """
-        Set the datafile path, then recalculate sample count. If not skipped,
-        update the hash and return the hash string.
+        Set the datafile path or in-memory data buffer, then recalculate sample
+        count. If not skipped, update the hash and return the hash string.
+        The `data_buffer` may be a BytesIO or any bytes-like object (e.g. mmap).
         """
         if self.get_global_field(self.DATATYPE_KEY) is None:
             raise SigMFFileError("Error setting data file, the DATATYPE_KEY must be set in the global metadata first.")
@@ -529,7 +585,7 @@ class SigMFFile(SigMFMetafile):
                 raveled = np.memmap(self.data_file, mode=open_mode, shape=memmap_shape, **common_args)
             elif self.data_buffer is not None:
                 buffer_count = -1 if mapped_length is None else mapped_length
-                raveled = np.frombuffer(self.data_buffer.getbuffer(), count=buffer_count, **common_args)
+                raveled = np.frombuffer(self._get_data_buffer(), count=buffer_count, **common_args)
             else:
                 raise ValueError('In sigmffile.set_data_file(), either data_file or data_buffer must be not None')
         except:  # TODO include likely exceptions here
@@ -630,7 +686,7 @@ class SigMFFile(SigMFMetafile):
             raise IOError('Number of samples must be greater than zero, or -1 for all samples.')
         elif start_index + count > self.sample_count:
             raise IOError("Cannot read beyond EOF.")
-        if self.data_file is None:
+        if self.data_file is None and self.data_buffer is None:
             if self.get_global_field(self.METADATA_ONLY_KEY, False):
                 # only if data_file is `None` allows access to dynamically generated datsets
                 raise SigMFFileError("Cannot read samples from a metadata only distribution.")
@@ -640,11 +696,11 @@ class SigMFFile(SigMFMetafile):
 
         if not self._is_conforming_dataset():
             warnings.warn(f'Recording dataset appears non-compliant, resulting data may be erroneous')
-        return self._read_datafile(first_byte, count * self.get_num_channels(), autoscale, False)
+        return self._read_datafile(first_byte, count * self.get_num_channels(), autoscale, raw_components)
 
     def _read_datafile(self, first_byte, nitems, autoscale, raw_components):
         '''
-        internal function for reading samples from datafile
+        internal function for reading samples from datafile or data buffer
         '''
         dtype = dtype_info(self.get_global_field(self.DATATYPE_KEY))
         self.is_complex_data = dtype['is_complex']
@@ -657,9 +713,20 @@ class SigMFFile(SigMFMetafile):
         data_type_out = np.dtype("f4") if not self.is_complex_data else np.dtype("f4, f4")
         num_channels = self.get_num_channels()
 
-        fp = open(self.data_file, "rb")
-        fp.seek(first_byte, 0)
-        data = np.fromfile(fp, dtype=data_type_in, count=nitems)
+        if nitems < 0:
+            # read to the end of the dataset
+            nitems = (self._get_data_size() - first_byte) // data_type_in.itemsize
+        # archive members start part way into the archive file or buffer
+        first_byte += 0 if self.offset_and_size is None else self.offset_and_size[0]
+        if self.data_file is not None and raw_components:
+            # raw components need no conversion, so map them instead of reading a copy
+            data = np.memmap(self.data_file, dtype=data_type_in, mode="r", offset=first_byte, shape=(nitems,))
+        elif self.data_file is not None:
+            with open(self.data_file, "rb") as fp:
+                fp.seek(first_byte, 0)
+                data = np.fromfile(fp, dtype=data_type_in, count=nitems)
+        else:
+            data = np.frombuffer(self._get_data_buffer(), dtype=data_type_in, count=nitems, offset=first_byte)
         if num_channels != 1:
             # return reshaped view for num_channels
             # first dimension will be double size if `is_complex_data`
@@ -677,7 +744,6 @@ class SigMFFile(SigMFMetafile):
         else:
             data = data.view(component_type_in)
 
-        fp.close()
         return data
 
 
@@ -815,11 +881,12 @@ class SigMFCollection(SigMFMetafile):
         Returns the SigMFFile instance of the specified stream if it exists
         '''
         metafile = None
+        stream_names = self.get_stream_names()
         if stream_name is not None:
-            if stream_name in self.get_stream_names():
+            if stream_name in stream_names:
                 metafile = stream_name + '.sigmf_meta'
-        if stream_index is not None and stream_index < self.__len__():
-            metafile = self.get_stream_names()[stream_index] + '.sigmf_meta'
+        if stream_index is not None and stream_index < len(stream_names):
+            metafile = stream_names[stream_index] + '.sigmf_meta'
 
         if metafile is not None:
             return fromfile(metafile, skip_checksum=self.skip_checksums)
@@ -927,13 +994,44 @@ def get_dataset_filename_from_metadata(meta_fn, metadata=None):
     return None
 
 
-def fromarchive(archive_path, dir=None):
+def _get_archive_buffer(fileobj):
+    """
+    Return a buffer over the archive in `fileobj`, starting at its current position.
+    Files on disk are memory-mapped, in-memory file objects are used directly.
+    """
+    if hasattr(fileobj, "getbuffer"):
+        return fileobj
+    # asking a SpooledTemporaryFile for fileno() would roll it over to disk
+    if not isinstance(fileobj, tempfile.SpooledTemporaryFile):
+        try:
+            archive_map = mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError):
+            # no file descriptor (io.UnsupportedOperation is an OSError), an empty
+            # file, or one that can't be mapped, so read it instead
+            pass
+        else:
+            archive_map.seek(fileobj.tell())
+            return archive_map
+    try:
+        return io.BytesIO(fileobj.read())
+    except (AttributeError, OSError) as err:
+        raise SigMFFileError("fileobj {!r} is not readable".format(fileobj)) from err
+
+
+def fromarchive(archive_path=None, dir=None, fileobj=None):
     """Extract an archive and return a SigMFFile.
 
+    The archive may be given by `archive_path` or as a binary `fileobj`
+    positioned at the start of the archive. A `fileobj` backed by a file on
+    disk is memory-mapped like `archive_path`. Other file objects without
+    `getbuffer()`, including any SpooledTemporaryFile, are read into memory.
+
     The `dir` parameter is no longer used as this function has been changed to
     access SigMF archives without extracting them.
     """
     from .archivereader import SigMFArchiveReader
+    if fileobj is not None:
+        return SigMFArchiveReader(archive_buffer=_get_archive_buffer(fileobj)).sigmffile
     return SigMFArchiveReader(archive_path).sigmffile
 
 
@@ -968,20 +1066,14 @@ def fromfile(filename, skip_checksum=False):
         return fromarchive(archive_fn)
 
     if (ext.lower().endswith(SIGMF_COLLECTION_EXT) or not path.isfile(meta_fn)) and path.isfile(collection_fn):
-        collection_fp = open(collection_fn, "rb")
-        bytestream_reader = codecs.getreader("utf-8")
-        mdfile_reader = bytestream_reader(collection_fp)
-        metadata = json.load(mdfile_reader)
-        collection_fp.close()
+        with open(collection_fn, "rb") as collection_fp:
+            metadata = _loads(collection_fp.read())
 
         return SigMFCollection(metadata=metadata, skip_checksums=skip_checksum)
 
     else:
-        meta_fp = open(meta_fn, "rb")
-        bytestream_reader = codecs.getreader("utf-8")
-        mdfile_reader = bytestream_reader(meta_fp)
-        metadata = json.load(mdfile_reader)
-        meta_fp.close()
+        with open(meta_fn, "rb") as meta_fp:
+            metadata = _loads(meta_fp.read())
 
         data_fn = get_dataset_filename_from_metadata(meta_fn, metadata)
         return SigMFFile(metadata=metadata, data_file=data_fn, skip_checksum=skip_checksum)
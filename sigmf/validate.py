@@ -9,6 +9,7 @@
 import argparse
 import json
 import logging
+from collections import OrderedDict
 
 import jsonschema
 
@@ -52,6 +53,30 @@ def get_default_metadata(ref_schema=schema.get_schema()):
     return default
 
 
+# validators for recently used schemas, oldest first
+_validators = OrderedDict()
+_VALIDATOR_CACHE_SIZE = 8
+
+
+def get_validator(ref_schema):
+    '''
+    Return a jsonschema validator for `ref_schema`. The schema is checked and
+    the validator built only once while the schema object is among the most
+    recently used ones.
+    '''
+    key = id(ref_schema)
+    if key in _validators:
+        _validators.move_to_end(key)
+    else:
+        validator_class = jsonschema.validators.validator_for(ref_schema)
+        validator_class.check_schema(ref_schema)
+        # keep a reference to the schema so its id cannot be reused while cached
+        _validators[key] = (ref_schema, validator_class(ref_schema))
+        if len(_validators) > _VALIDATOR_CACHE_SIZE:
+            _validators.popitem(last=False)
+    return _validators[key][1]
+
+
 def validate(metadata, ref_schema=schema.get_schema()):
     '''
     Check that the provided `metadata` dict is valid according to the `ref_schema` dict.
@@ -70,7 +95,9 @@ def validate(metadata, ref_schema=schema.get_schema()):
     -------
     None, will raise error if invalid.
     '''
-    jsonschema.validators.validate(instance=metadata, schema=ref_schema)
+    error = jsonschema.exceptions.best_match(get_validator(ref_schema).iter_errors(metadata))
+    if error is not None:
+        raise error
 
     # assure capture and annotation order
     # TODO: There is a way to do this with just the schema apparently.
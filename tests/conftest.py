@@ -16,17 +16,22 @@ from sigmf.sigmffile import SigMFFile
 from .testdata import TEST_FLOAT32_DATA, TEST_METADATA
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_data_file():
-    """when called, yields temporary file"""
+    """when called, yields temporary file shared across the test session"""
     with tempfile.NamedTemporaryFile() as temp:
-        TEST_FLOAT32_DATA.tofile(temp.name)
+        # explicit little-endian to match the rf32_le datatype in TEST_METADATA
+        temp.write(TEST_FLOAT32_DATA.astype("<f4", copy=False).tobytes())
+        temp.flush()
         yield temp
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def test_sigmffile(test_data_file):
-    """If pytest uses this signature, will return valid SigMF file."""
+    """
+    If pytest uses this signature, will return valid SigMF file.
+    Shared within a module, so tests that modify it must work on a copy.
+    """
     meta = SigMFFile()
     meta.set_global_field("core:datatype", "rf32_le")
     meta.set_global_field("core:version", __specification__)
@@ -35,3 +40,9 @@ def test_sigmffile(test_data_file):
     meta.set_data_file(test_data_file.name)
     assert meta._metadata == TEST_METADATA
     return meta
+
+
+@pytest.fixture(scope="module")
+def test_archive(test_sigmffile, tmp_path_factory):
+    """path to an archive of test_sigmffile, written once and shared within a module"""
+    return test_sigmffile.archive(name=str(tmp_path_factory.mktemp("archive") / "test"))
@@ -7,6 +7,8 @@
 """Tests for SigMFArchive"""
 
 import codecs
+import copy
+import io
 import json
 import tarfile
 import tempfile
@@ -22,30 +24,45 @@ from sigmf.archive import SIGMF_DATASET_EXT, SIGMF_METADATA_EXT
 from .testdata import TEST_FLOAT32_DATA, TEST_METADATA
 
 
-def create_test_archive(test_sigmffile, tmpfile):
-    sigmf_archive = test_sigmffile.archive(fileobj=tmpfile)
-    sigmf_tarfile = tarfile.open(sigmf_archive, mode="r", format=tarfile.PAX_FORMAT)
-    return sigmf_tarfile
+def create_test_archive(test_sigmffile, tmpfile, name=None):
+    """archive into `tmpfile` (an open file or in-memory stream), return reopened tarfile & its members"""
+    test_sigmffile.archive(name=name, fileobj=tmpfile)
+    tmpfile.seek(0)
+    sigmf_tarfile = tarfile.open(fileobj=tmpfile, mode="r")
+    return sigmf_tarfile, sigmf_tarfile.getmembers()
 
 
-def test_without_data_file_throws_fileerror(test_sigmffile):
-    test_sigmffile.data_file = None
-    with tempfile.NamedTemporaryFile() as temp:
-        with pytest.raises(error.SigMFFileError):
-            test_sigmffile.archive(name=temp.name)
+@pytest.fixture(scope="module")
+def test_archive_bytes(test_sigmffile):
+    """archive built once per module, tests that only inspect it reopen it from memory"""
+    stream = io.BytesIO()
+    test_sigmffile.archive(name="test", fileobj=stream)
+    return stream.getvalue()
 
 
-def test_invalid_md_throws_validationerror(test_sigmffile):
-    del test_sigmffile._metadata["global"]["core:datatype"]  # required field
-    with tempfile.NamedTemporaryFile() as temp:
-        with pytest.raises(jsonschema.exceptions.ValidationError):
-            test_sigmffile.archive(name=temp.name)
+def open_test_archive(archive_bytes):
+    """return tarfile reopened from `archive_bytes` & its members"""
+    sigmf_tarfile = tarfile.open(fileobj=io.BytesIO(archive_bytes), mode="r")
+    return sigmf_tarfile, sigmf_tarfile.getmembers()
 
 
-def test_name_wrong_extension_throws_fileerror(test_sigmffile):
-    with tempfile.NamedTemporaryFile() as temp:
-        with pytest.raises(error.SigMFFileError):
-            test_sigmffile.archive(name=temp.name + ".zip")
+def test_without_data_file_throws_fileerror(test_sigmffile, tmp_path):
+    sigmffile = copy.deepcopy(test_sigmffile)
+    sigmffile.data_file = None
+    with pytest.raises(error.SigMFFileError):
+        sigmffile.archive(name=str(tmp_path / "test"))
+
+
+def test_invalid_md_throws_validationerror(test_sigmffile, tmp_path):
+    sigmffile = copy.deepcopy(test_sigmffile)
+    del sigmffile._metadata["global"]["core:datatype"]  # required field
+    with pytest.raises(jsonschema.exceptions.ValidationError):
+        sigmffile.archive(name=str(tmp_path / "test"))
+
+
+def test_name_wrong_extension_throws_fileerror(test_sigmffile, tmp_path):
+    with pytest.raises(error.SigMFFileError):
+        test_sigmffile.archive(name=str(tmp_path / "test.zip"))
 
 
 def test_fileobj_extension_ignored(test_sigmffile):
@@ -69,14 +86,22 @@ def test_name_used_in_fileobj(test_sigmffile):
 
 
 def test_fileobj_not_closed(test_sigmffile):
-    with tempfile.NamedTemporaryFile() as temp:
-        test_sigmffile.archive(fileobj=temp)
-        assert not temp.file.closed
+    stream = io.BytesIO()
+    test_sigmffile.archive(name="test", fileobj=stream)
+    assert not stream.closed
 
 
 def test_unwritable_fileobj_throws_fileerror(test_sigmffile):
     with tempfile.NamedTemporaryFile(mode="rb") as temp:
-        with pytest.raises(error.SigMFFileError):
+        with pytest.raises(error.SigMFFileError, match="not writable"):
+            test_sigmffile.archive(fileobj=temp)
+
+
+def test_text_fileobj_throws_fileerror(test_sigmffile):
+    with pytest.raises(error.SigMFFileError, match="not binary"):
+        test_sigmffile.archive(name="test", fileobj=io.StringIO())
+    with tempfile.NamedTemporaryFile(mode="w") as temp:
+        with pytest.raises(error.SigMFFileError, match="not binary"):
             test_sigmffile.archive(fileobj=temp)
 
 
@@ -88,19 +113,23 @@ def test_unwritable_name_throws_fileerror(test_sigmffile):
         test_sigmffile.archive(name=unwritable_file)
 
 
-def test_tarfile_layout(test_sigmffile):
-    with tempfile.NamedTemporaryFile() as temp:
-        sigmf_tarfile = create_test_archive(test_sigmffile, temp)
-        basedir, file1, file2 = sigmf_tarfile.getmembers()
-        assert tarfile.TarInfo.isdir(basedir)
-        assert tarfile.TarInfo.isfile(file1)
-        assert tarfile.TarInfo.isfile(file2)
+def test_tarfile_layout(test_archive_bytes):
+    _, (basedir, file1, file2) = open_test_archive(test_archive_bytes)
+    assert tarfile.TarInfo.isdir(basedir)
+    assert tarfile.TarInfo.isfile(file1)
+    assert tarfile.TarInfo.isfile(file2)
 
 
-def test_tarfile_names_and_extensions(test_sigmffile):
-    with tempfile.NamedTemporaryFile() as temp:
-        sigmf_tarfile = create_test_archive(test_sigmffile, temp)
-        basedir, file1, file2 = sigmf_tarfile.getmembers()
+def test_tarfile_member_order(test_archive_bytes):
+    """dataset should precede metadata so the metadata can be updated in place"""
+    _, (basedir, file1, file2) = open_test_archive(test_archive_bytes)
+    assert file1.name == path.join(basedir.name, basedir.name + SIGMF_DATASET_EXT)
+    assert file2.name == path.join(basedir.name, basedir.name + SIGMF_METADATA_EXT)
+
+
+def test_tarfile_names_and_extensions(test_sigmffile, tmp_path):
+    with open(tmp_path / "test", "w+b") as temp:
+        _, (basedir, file1, file2) = create_test_archive(test_sigmffile, temp)
         archive_name = basedir.name
         assert archive_name == path.split(temp.name)[-1]
         file_extensions = {SIGMF_DATASET_EXT, SIGMF_METADATA_EXT}
@@ -116,39 +145,44 @@ def test_tarfile_names_and_extensions(test_sigmffile):
         assert file2_ext in file_extensions
 
 
-def test_tarfile_persmissions(test_sigmffile):
-    with tempfile.NamedTemporaryFile() as temp:
-        sigmf_tarfile = create_test_archive(test_sigmffile, temp)
-        basedir, file1, file2 = sigmf_tarfile.getmembers()
-        assert basedir.mode == 0o755
-        assert file1.mode == 0o644
-        assert file2.mode == 0o644
+def test_tarfile_persmissions(test_archive_bytes):
+    _, (basedir, file1, file2) = open_test_archive(test_archive_bytes)
+    assert basedir.mode == 0o755
+    assert file1.mode == 0o644
+    assert file2.mode == 0o644
 
 
-def test_contents(test_sigmffile):
-    with tempfile.NamedTemporaryFile() as temp:
-        sigmf_tarfile = create_test_archive(test_sigmffile, temp)
-        basedir, file1, file2 = sigmf_tarfile.getmembers()
-        if file1.name.endswith(SIGMF_METADATA_EXT):
-            mdfile = file1
-            datfile = file2
-        else:
-            mdfile = file2
-            datfile = file1
+def test_contents(test_archive_bytes):
+    sigmf_tarfile, (basedir, file1, file2) = open_test_archive(test_archive_bytes)
+    if file1.name.endswith(SIGMF_METADATA_EXT):
+        mdfile = file1
+        datfile = file2
+    else:
+        mdfile = file2
+        datfile = file1
 
-        bytestream_reader = codecs.getreader("utf-8")  # bytes -> str
-        mdfile_reader = bytestream_reader(sigmf_tarfile.extractfile(mdfile))
-        assert json.load(mdfile_reader) == TEST_METADATA
+    bytestream_reader = codecs.getreader("utf-8")  # bytes -> str
+    mdfile_reader = bytestream_reader(sigmf_tarfile.extractfile(mdfile))
+    assert json.load(mdfile_reader) == TEST_METADATA
 
-        datfile_reader = sigmf_tarfile.extractfile(datfile)
-        # calling `fileno` on `tarfile.ExFileObject` throws error (?), but
-        # np.fromfile requires it, so we need this extra step
-        data = np.frombuffer(datfile_reader.read(), dtype=np.float32)
+    datfile_reader = sigmf_tarfile.extractfile(datfile)
+    # calling `fileno` on `tarfile.ExFileObject` throws error (?), but
+    # np.fromfile requires it, so read into a preallocated buffer instead
+    buffer = bytearray(datfile.size)
+    assert datfile_reader.readinto(buffer) == datfile.size
+    data = np.frombuffer(buffer, dtype=np.float32)
 
-        assert np.array_equal(data, TEST_FLOAT32_DATA)
+    assert np.array_equal(data, TEST_FLOAT32_DATA)
 
 
-def test_tarfile_type(test_sigmffile):
-    with tempfile.NamedTemporaryFile() as temp:
-        sigmf_tarfile = create_test_archive(test_sigmffile, temp)
-        assert sigmf_tarfile.format == tarfile.PAX_FORMAT
+def test_tarfile_type(test_archive_bytes):
+    """archive should be POSIX (ustar/pax), not GNU tar"""
+    # the format argument is ignored when reading, so check the header magic directly
+    assert test_archive_bytes[257:265] == tarfile.POSIX_MAGIC
+
+
+def test_tarfile_no_pax_headers(test_archive_bytes):
+    """short member names should not need extended PAX headers"""
+    _, members = open_test_archive(test_archive_bytes)
+    for member in members:
+        assert member.pax_headers == {}
@@ -6,77 +6,75 @@
 
 """Tests for SigMFArchiveReader"""
 
-import tempfile
-import unittest
+import io
 
 import numpy as np
+import pytest
 
 from sigmf import SigMFArchiveReader, SigMFFile, __specification__
 
+from .testdata import DTYPES, RAW_COUNT, TEST_FLOAT32_DATA, TEST_METADATA
 
-class TestArchiveReader(unittest.TestCase):
-    def setUp(self):
-        # in order to check shapes we need some positive number of samples to work with
-        # number of samples should be lowest common factor of num_channels
-        self.raw_count = 16
-        self.lut = {
-            "i8": np.int8,
-            "u8": np.uint8,
-            "i16": np.int16,
-            "u16": np.uint16,
-            "u32": np.uint32,
-            "i32": np.int32,
-            "f32": np.float32,
-            "f64": np.float64,
-        }
-
-    def test_access_data_without_untar(self):
-        """iterate through datatypes and verify IO is correct"""
-        _, temp_path = tempfile.mkstemp()
-        _, temp_archive = tempfile.mkstemp(suffix=".sigmf")
-
-        for key, dtype in self.lut.items():
-            # for each type of storage
-            temp_samples = np.arange(self.raw_count, dtype=dtype)
-            temp_samples.tofile(temp_path)
-            for num_channels in [1, 4, 8]:
-                # for single or 8 channel
-                for complex_prefix in ["r", "c"]:
-                    # for real or complex
-                    target_count = self.raw_count
-                    temp_meta = SigMFFile(
-                        data_file=temp_path,
-                        global_info={
-                            SigMFFile.DATATYPE_KEY: f"{complex_prefix}{key}_le",
-                            SigMFFile.NUM_CHANNELS_KEY: num_channels,
-                            SigMFFile.VERSION_KEY: __specification__,
-                        },
-                    )
-                    temp_meta.tofile(temp_archive, toarchive=True)
-
-                    readback = SigMFArchiveReader(temp_archive)
-                    readback_samples = readback[:]
-
-                    if complex_prefix == "c":
-                        # complex data will be half as long
-                        target_count //= 2
-                        self.assertTrue(np.all(np.iscomplex(readback_samples)))
-                    if num_channels != 1:
-                        # check expected # of channels
-                        self.assertEqual(
-                            readback_samples.ndim,
-                            2,
-                            "Mismatch in shape of readback samples.",
-                        )
-                    target_count //= num_channels
-
-                    self.assertEqual(
-                        target_count,
-                        temp_meta._count_samples(),
-                        "Mismatch in expected metadata length.",
-                    )
-                    self.assertEqual(
-                        target_count,
-                        len(readback),
-                        "Mismatch in expected readback length",
-                    )
+
+@pytest.fixture(scope="module")
+def sample_files(tmp_path_factory):
+    """raw sample file for each datatype, written once and shared by all cases"""
+    temp_dir = tmp_path_factory.mktemp("samples")
+    paths = {}
+    for key, dtype in DTYPES.items():
+        paths[key] = str(temp_dir / f"{key}.dat")
+        np.arange(RAW_COUNT, dtype=dtype).tofile(paths[key])
+    return paths
+
+
+@pytest.mark.parametrize("complex_prefix", ["r", "c"])
+@pytest.mark.parametrize("num_channels", [1, 4, 8])
+@pytest.mark.parametrize("key", DTYPES)
+def test_access_data_without_untar(key, num_channels, complex_prefix, sample_files):
+    """for each datatype, channel count and real/complex verify IO is correct"""
+    temp_path = sample_files[key]
+    # archive is written to and read back from memory
+    temp_archive = io.BytesIO()
+
+    # complex data will be half as long, and samples are split across channels
+    target_count = RAW_COUNT // (2 if complex_prefix == "c" else 1) // num_channels
+    temp_meta = SigMFFile(
+        data_file=temp_path,
+        global_info={
+            SigMFFile.DATATYPE_KEY: f"{complex_prefix}{key}_le",
+            SigMFFile.NUM_CHANNELS_KEY: num_channels,
+            SigMFFile.VERSION_KEY: __specification__,
+        },
+    )
+    temp_meta.archive(name="arch", fileobj=temp_archive)
+    temp_archive.seek(0)
+
+    readback = SigMFArchiveReader(archive_buffer=temp_archive, skip_checksum=True)
+    readback_samples = readback[:]
+
+    if complex_prefix == "c":
+        assert readback_samples.dtype.kind == "c"
+    if num_channels != 1:
+        # check expected # of channels
+        assert readback.ndim == readback_samples.ndim == 2, "Mismatch in shape of readback samples."
+
+    assert target_count == temp_meta._count_samples(), "Mismatch in expected metadata length."
+    assert target_count == len(readback), "Mismatch in expected readback length"
+
+
+def test_archive_read(test_archive):
+    """read an archive from disk and verify its checksum"""
+    readback = SigMFArchiveReader(test_archive)
+    assert readback.sigmffile.get_global_field(SigMFFile.HASH_KEY) == TEST_METADATA[SigMFFile.GLOBAL_KEY][SigMFFile.HASH_KEY]
+    assert np.array_equal(readback[:], TEST_FLOAT32_DATA)
+    assert np.array_equal(readback.sigmffile.read_samples(), TEST_FLOAT32_DATA)
+
+
+def test_archive_buffer(test_archive):
+    """read an archive from an in-memory buffer and verify its checksum"""
+    with open(test_archive, "rb") as handle:
+        archive_buffer = io.BytesIO(handle.read())
+    readback = SigMFArchiveReader(archive_buffer=archive_buffer)
+    assert readback.sigmffile.get_global_field(SigMFFile.HASH_KEY) == TEST_METADATA[SigMFFile.GLOBAL_KEY][SigMFFile.HASH_KEY]
+    assert np.array_equal(readback[:], TEST_FLOAT32_DATA)
+    assert np.array_equal(readback.sigmffile.read_samples(), TEST_FLOAT32_DATA)
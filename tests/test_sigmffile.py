@@ -6,35 +6,42 @@
 
 """Tests for SigMFFile Object"""
 
+import codecs
 import copy
+import datetime
 import json
+import mmap
 import os
 import shutil
+import tarfile
 import tempfile
 import unittest
 from pathlib import Path
 
 import numpy as np
+import pytest
 
-from sigmf import sigmffile, utils
+from sigmf import error, sigmffile, utils
 from sigmf.sigmffile import SigMFFile
 
 from .testdata import *
 
 
 class TestClassMethods(unittest.TestCase):
-    def setUp(self):
-        """ensure tests have a valid SigMF object to work with"""
-        self.temp_dir = Path(tempfile.mkdtemp())
-        self.temp_path_data = self.temp_dir / "trash.sigmf-data"
-        self.temp_path_meta = self.temp_dir / "trash.sigmf-meta"
-        TEST_FLOAT32_DATA.tofile(self.temp_path_data)
-        self.sigmf_object = SigMFFile(TEST_METADATA, data_file=self.temp_path_data)
-        self.sigmf_object.tofile(self.temp_path_meta)
-
-    def tearDown(self):
+    @classmethod
+    def setUpClass(cls):
+        """ensure tests have a valid SigMF object to work with, shared by all tests in the class"""
+        cls.temp_dir = Path(tempfile.mkdtemp())
+        cls.temp_path_data = cls.temp_dir / "trash.sigmf-data"
+        cls.temp_path_meta = cls.temp_dir / "trash.sigmf-meta"
+        TEST_FLOAT32_DATA.tofile(cls.temp_path_data)
+        cls.sigmf_object = SigMFFile(TEST_METADATA, data_file=cls.temp_path_data)
+        cls.sigmf_object.tofile(cls.temp_path_meta)
+
+    @classmethod
+    def tearDownClass(cls):
         """remove temporary dir"""
-        shutil.rmtree(self.temp_dir)
+        shutil.rmtree(cls.temp_dir)
 
     def test_pathlib_handle(self):
         """ensure file can be a string or a pathlib object"""
@@ -143,15 +150,71 @@ def test_add_annotation():
     sigf.add_annotation(start_index=0, length=128, metadata=meta)
 
 
-def test_fromarchive(test_sigmffile):
+def test_fromarchive(test_sigmffile, test_archive, tmp_path):
     print("test_sigmffile is:\n", test_sigmffile)
-    tf = tempfile.mkstemp()[1]
-    td = tempfile.mkdtemp()
-    archive_path = test_sigmffile.archive(name=tf)
-    result = sigmffile.fromarchive(archive_path=archive_path, dir=td)
+    result = sigmffile.fromarchive(archive_path=test_archive, dir=str(tmp_path))
     assert result._metadata == test_sigmffile._metadata == TEST_METADATA
-    os.remove(tf)
-    shutil.rmtree(td)
+
+
+def test_fromarchive_fileobj(test_sigmffile):
+    """ensure an archive can be read back from a file object without touching disk"""
+    with tempfile.SpooledTemporaryFile() as temp:
+        test_sigmffile.archive(name="test", fileobj=temp)
+        temp.seek(0)
+        result = sigmffile.fromarchive(fileobj=temp)
+    assert result._metadata == test_sigmffile._metadata == TEST_METADATA
+    assert np.array_equal(result.read_samples(), TEST_FLOAT32_DATA)
+
+
+def test_fromarchive_file_handle(test_archive):
+    """ensure an archive file handle is memory-mapped rather than read into memory"""
+    with open(test_archive, "rb") as handle:
+        result = sigmffile.fromarchive(fileobj=handle)
+    assert isinstance(result.data_buffer, mmap.mmap)
+    assert result._metadata == TEST_METADATA
+    assert np.array_equal(result.read_samples(), TEST_FLOAT32_DATA)
+
+
+def test_fromarchive_bad_file_handle(tmp_path):
+    """ensure empty or unreadable handles fail like the other archive inputs"""
+    empty_path = tmp_path / "empty.sigmf"
+    empty_path.touch()
+    with open(empty_path, "rb") as handle:
+        with pytest.raises(tarfile.ReadError):
+            sigmffile.fromarchive(fileobj=handle)
+    with open(empty_path, "wb") as handle:
+        with pytest.raises(error.SigMFFileError):
+            sigmffile.fromarchive(fileobj=handle)
+
+
+def test_metadata_from_json():
+    """ensure metadata can be parsed from str or bytes, including forms orjson rejects"""
+    md_str = json.dumps(TEST_METADATA)
+    assert SigMFFile(metadata=md_str)._metadata == TEST_METADATA
+    assert SigMFFile(metadata=md_str.encode("utf-8"))._metadata == TEST_METADATA
+    assert SigMFFile(metadata=codecs.BOM_UTF8 + md_str.encode("utf-8"))._metadata == TEST_METADATA
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_metadata_from_json_big_int(use_orjson, monkeypatch):
+    """assure integers beyond 64 bits are parsed exactly whether or not orjson is installed"""
+    if not use_orjson:
+        monkeypatch.setattr(sigmffile, "orjson", None)
+    elif sigmffile.orjson is None:
+        pytest.skip("orjson is not installed")
+    md_str = json.dumps({"global": {"test:big": 2**64, "test:small": -(2**63) - 1, "test:int": 7}})
+    for md in (md_str, md_str.encode("utf-8")):
+        global_info = SigMFFile(metadata=md).get_global_info()
+        assert global_info == {"test:big": 2**64, "test:small": -(2**63) - 1, "test:int": 7}
+        assert all(type(value) is int for value in global_info.values())
+
+
+def test_set_data_file_buffer():
+    """ensure a bytes-like data buffer can be used in place of a data file"""
+    smf = SigMFFile(copy.deepcopy(TEST_METADATA))
+    smf.set_data_file(data_buffer=TEST_FLOAT32_DATA.tobytes())
+    assert smf.sample_count == len(TEST_FLOAT32_DATA)
+    assert np.array_equal(smf[:], TEST_FLOAT32_DATA)
 
 
 def test_add_multiple_captures_and_annotations():
@@ -160,68 +223,62 @@ def test_add_multiple_captures_and_annotations():
         simulate_capture(sigf, idx, 1024)
 
 
-class TestMultichannel(unittest.TestCase):
-    def setUp(self):
-        # in order to check shapes we need some positive number of samples to work with
-        # number of samples should be lowest common factor of num_channels
-        self.raw_count = 16
-        self.lut = {
-            "i8": np.int8,
-            "u8": np.uint8,
-            "i16": np.int16,
-            "u16": np.uint16,
-            "u32": np.uint32,
-            "i32": np.int32,
-            "f32": np.float32,
-            "f64": np.float64,
-        }
-
-    def test_multichannel_types(self):
-        """check that real & complex for all types is reading multiple channels correctly"""
-        _, temp_path = tempfile.mkstemp()
-        for key, dtype in self.lut.items():
-            # for each type of storage
-            np.arange(self.raw_count, dtype=dtype).tofile(temp_path)
-            for num_channels in [1, 4, 8]:
-                # for single or 8 channel
-                for complex_prefix in ["r", "c"]:
-                    # for real or complex
-                    check_count = self.raw_count
-                    temp_signal = SigMFFile(
-                        data_file=temp_path,
-                        global_info={
-                            SigMFFile.DATATYPE_KEY: f"{complex_prefix}{key}_le",
-                            SigMFFile.NUM_CHANNELS_KEY: num_channels,
-                        },
-                    )
-                    temp_samples = temp_signal.read_samples()
-
-                    if complex_prefix == "c":
-                        # complex data will be half as long
-                        check_count //= 2
-                        self.assertTrue(np.all(np.iscomplex(temp_samples)))
-                    if num_channels != 1:
-                        self.assertEqual(temp_samples.ndim, 2)
-                    check_count //= num_channels
-
-                    self.assertEqual(check_count, temp_signal._count_samples())
-
-    def test_multichannel_seek(self):
-        """assure that seeking is working correctly with multichannel files"""
-        _, temp_path = tempfile.mkstemp()
-        # write some dummy data and read back
-        np.arange(18, dtype=np.uint16).tofile(temp_path)
-        temp_signal = SigMFFile(
-            data_file=temp_path,
-            global_info={
-                SigMFFile.DATATYPE_KEY: "cu16_le",
-                SigMFFile.NUM_CHANNELS_KEY: 3,
-            },
-        )
-        # read after the first sample
-        temp_samples = temp_signal.read_samples(start_index=1, autoscale=False)
-        # assure samples are in the order we expect
-        self.assertTrue(np.all(temp_samples[:, 0] == np.array([6 + 7j, 12 + 13j])))
+@pytest.mark.parametrize("complex_prefix", ["r", "c"])
+@pytest.mark.parametrize("num_channels", [1, 4, 8])
+@pytest.mark.parametrize("key", DTYPES)
+def test_multichannel_types(key, num_channels, complex_prefix):
+    """check that real & complex for all types is reading multiple channels correctly"""
+    # complex data will be half as long, and samples are split across channels
+    check_count = RAW_COUNT // (2 if complex_prefix == "c" else 1) // num_channels
+    temp_signal = SigMFFile(
+        data_buffer=np.arange(RAW_COUNT, dtype=DTYPES[key]).tobytes(),
+        global_info={
+            SigMFFile.DATATYPE_KEY: f"{complex_prefix}{key}_le",
+            SigMFFile.NUM_CHANNELS_KEY: num_channels,
+        },
+    )
+    temp_samples = temp_signal.read_samples()
+
+    if complex_prefix == "c":
+        assert np.issubdtype(temp_samples.dtype, np.complexfloating)
+    if num_channels != 1:
+        assert temp_samples.ndim == 2
+
+    assert check_count == temp_signal._count_samples()
+
+
+def test_multichannel_seek(tmp_path):
+    """assure that seeking is working correctly with multichannel files"""
+    temp_path = tmp_path / "seek.sigmf-data"
+    # write some dummy data and read back
+    np.arange(18, dtype=np.uint16).tofile(temp_path)
+    temp_signal = SigMFFile(
+        data_file=temp_path,
+        global_info={
+            SigMFFile.DATATYPE_KEY: "cu16_le",
+            SigMFFile.NUM_CHANNELS_KEY: 3,
+        },
+    )
+    # read after the first sample
+    temp_samples = temp_signal.read_samples(start_index=1, autoscale=False)
+    # assure samples are in the order we expect
+    assert np.all(temp_samples[:, 0] == np.array([6 + 7j, 12 + 13j]))
+
+
+def test_read_samples_raw_components(tmp_path):
+    """assure raw components are returned unconverted as a view of the data file"""
+    temp_path = tmp_path / "raw.sigmf-data"
+    np.arange(16, dtype=np.int16).tofile(temp_path)
+    temp_signal = SigMFFile(
+        data_file=temp_path,
+        global_info={
+            SigMFFile.DATATYPE_KEY: "ci16_le",
+            SigMFFile.NUM_CHANNELS_KEY: 2,
+        },
+    )
+    temp_samples = temp_signal.read_samples(start_index=1, raw_components=True)
+    assert isinstance(temp_samples, np.memmap)
+    assert np.array_equal(temp_samples, np.arange(4, 16, dtype=np.int16).reshape(3, 4))
 
 
 def test_key_validity():
@@ -247,31 +304,46 @@ def test_ordered_metadata():
         assert kdx == top_sort_order.index(key)
 
 
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_non_finite(use_orjson, monkeypatch):
+    """assure NaN and Infinity are written the same whether or not orjson is installed"""
+    if not use_orjson:
+        monkeypatch.setattr(sigmffile, "orjson", None)
+    elif sigmffile.orjson is None:
+        pytest.skip("orjson is not installed")
+    sigf = SigMFFile(copy.deepcopy(TEST_METADATA))
+    sigf.set_global_field("test:inf", float("inf"))
+    sigf.set_global_field("test:nan", float("nan"))
+    sigf.set_global_field("test:none", None)
+    dumped = sigf.dumps(pretty=False)
+    assert '"test:inf": Infinity' in dumped
+    assert '"test:nan": NaN' in dumped
+    assert '"test:none": null' in dumped
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_datetime(use_orjson, monkeypatch):
+    """assure non-JSON types are rejected the same whether or not orjson is installed"""
+    if not use_orjson:
+        monkeypatch.setattr(sigmffile, "orjson", None)
+    elif sigmffile.orjson is None:
+        pytest.skip("orjson is not installed")
+    sigf = SigMFFile(copy.deepcopy(TEST_METADATA))
+    sigf.set_global_field("core:datetime", datetime.datetime(2024, 1, 2, 3, 4, 5))
+    with pytest.raises(TypeError):
+        sigf.dumps()
+
+
 def test_captures_checking():
     """
     these tests make sure the various captures access tools work properly
     """
-    np.array(TEST_U8_DATA0, dtype=np.uint8).tofile("/tmp/d0.sigmf-data")
-    with open("/tmp/d0.sigmf-meta", "w") as f0:
-        json.dump(TEST_U8_META0, f0)
-    np.array(TEST_U8_DATA1, dtype=np.uint8).tofile("/tmp/d1.sigmf-data")
-    with open("/tmp/d1.sigmf-meta", "w") as f1:
-        json.dump(TEST_U8_META1, f1)
-    np.array(TEST_U8_DATA2, dtype=np.uint8).tofile("/tmp/d2.sigmf-data")
-    with open("/tmp/d2.sigmf-meta", "w") as f2:
-        json.dump(TEST_U8_META2, f2)
-    np.array(TEST_U8_DATA3, dtype=np.uint8).tofile("/tmp/d3.sigmf-data")
-    with open("/tmp/d3.sigmf-meta", "w") as f3:
-        json.dump(TEST_U8_META3, f3)
-    np.array(TEST_U8_DATA4, dtype=np.uint8).tofile("/tmp/d4.sigmf-data")
-    with open("/tmp/d4.sigmf-meta", "w") as f4:
-        json.dump(TEST_U8_META4, f4)
-
-    sigmf0 = sigmffile.fromfile("/tmp/d0.sigmf-meta", skip_checksum=True)
-    sigmf1 = sigmffile.fromfile("/tmp/d1.sigmf-meta", skip_checksum=True)
-    sigmf2 = sigmffile.fromfile("/tmp/d2.sigmf-meta", skip_checksum=True)
-    sigmf3 = sigmffile.fromfile("/tmp/d3.sigmf-meta", skip_checksum=True)
-    sigmf4 = sigmffile.fromfile("/tmp/d4.sigmf-meta", skip_checksum=True)
+    test_data = [TEST_U8_DATA0, TEST_U8_DATA1, TEST_U8_DATA2, TEST_U8_DATA3, TEST_U8_DATA4]
+    test_meta = [TEST_U8_META0, TEST_U8_META1, TEST_U8_META2, TEST_U8_META3, TEST_U8_META4]
+    sigmf0, sigmf1, sigmf2, sigmf3, sigmf4 = [
+        SigMFFile(metadata=meta, data_buffer=data.tobytes(), skip_checksum=True)
+        for data, meta in zip(test_data, test_meta)
+    ]
 
     assert sigmf0._count_samples() == 256
     assert sigmf0._is_conforming_dataset()
@@ -312,26 +384,26 @@ def test_captures_checking():
     assert np.array_equal(np.array(range(64, 96)), sigmf4.read_samples_in_capture(1, autoscale=False)[:, 1])
 
 
-def test_slicing():
+def test_slicing(tmp_path):
     """Test __getitem___ builtin for sigmffile, make sure slicing and indexing works as expected."""
-    _, temp_data0 = tempfile.mkstemp()
-    np.array(TEST_U8_DATA0, dtype=np.uint8).tofile(temp_data0)
+    temp_data0 = tmp_path / "d0.sigmf-data"
+    TEST_U8_DATA0.tofile(temp_data0)
     sigmf0 = SigMFFile(metadata=TEST_U8_META0, data_file=temp_data0)
     assert np.array_equal(TEST_U8_DATA0, sigmf0[:])
     assert TEST_U8_DATA0[6] == sigmf0[6]
 
     # test float32
-    _, temp_data1 = tempfile.mkstemp()
+    temp_data1 = tmp_path / "d1.sigmf-data"
     np.array(TEST_FLOAT32_DATA, dtype=np.float32).tofile(temp_data1)
     sigmf1 = SigMFFile(metadata=TEST_METADATA, data_file=temp_data1)
     assert np.array_equal(TEST_FLOAT32_DATA, sigmf1[:])
     assert sigmf1[10] == TEST_FLOAT32_DATA[10]
 
     # test multiple channels
-    _, temp_data2 = tempfile.mkstemp()
-    np.array(TEST_U8_DATA4, dtype=np.uint8).tofile(temp_data2)
+    temp_data2 = tmp_path / "d2.sigmf-data"
+    TEST_U8_DATA4.tofile(temp_data2)
     sigmf2 = SigMFFile(TEST_U8_META4, data_file=temp_data2)
-    channelized = np.array(TEST_U8_DATA4).reshape((128, 2))
+    channelized = TEST_U8_DATA4.reshape((128, 2))
     assert np.array_equal(channelized, sigmf2[:][:])
     assert np.array_equal(sigmf2[10:20, 91:112], sigmf2.read_samples(autoscale=False)[10:20, 91:112])
     assert np.array_equal(sigmf2[0], channelized[0])
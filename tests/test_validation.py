@@ -6,9 +6,11 @@
 
 """Tests for Validator"""
 
+import copy
 import tempfile
 import unittest
 
+import pytest
 from jsonschema.exceptions import ValidationError
 
 import sigmf
@@ -85,3 +87,28 @@ class FailingCases(unittest.TestCase):
         self.metadata[SigMFFile.GLOBAL_KEY][SigMFFile.HASH_KEY] = "derp"
         with self.assertRaises(sigmf.error.SigMFFileError):
             SigMFFile(metadata=self.metadata, data_file=temp_path)
+
+
+def test_validator_cached():
+    """the validator for a schema should only be built once"""
+    ref_schema = sigmf.schema.get_schema()
+    assert ref_schema is sigmf.schema.get_schema()
+    assert sigmf.validate.get_validator(ref_schema) is sigmf.validate.get_validator(ref_schema)
+
+
+def test_non_string_version():
+    """a malformed core:version should fail validation rather than schema lookup"""
+    metadata = SigMFFile()._metadata
+    metadata[SigMFFile.GLOBAL_KEY][SigMFFile.DATATYPE_KEY] = "rf32_le"
+    metadata[SigMFFile.GLOBAL_KEY][SigMFFile.VERSION_KEY] = ["1.0.0"]
+    with pytest.raises(ValidationError):
+        SigMFFile(metadata).validate()
+
+
+def test_validator_cache_bounded():
+    """validating against many schema objects should not grow the cache without limit"""
+    metadata = SigMFFile()._metadata
+    metadata[SigMFFile.GLOBAL_KEY][SigMFFile.DATATYPE_KEY] = "rf32_le"
+    for _ in range(50):
+        sigmf.validate.validate(metadata, copy.deepcopy(sigmf.schema.get_schema()))
+    assert len(sigmf.validate._validators) <= sigmf.validate._VALIDATOR_CACHE_SIZE
@@ -12,6 +12,20 @@ from sigmf import SigMFFile, __specification__, __version__
 
 TEST_FLOAT32_DATA = np.arange(16, dtype=np.float32)
 
+# in order to check shapes we need some positive number of samples to work with
+# number of samples should be lowest common factor of num_channels
+RAW_COUNT = 16
+DTYPES = {
+    "i8": np.int8,
+    "u8": np.uint8,
+    "i16": np.int16,
+    "u16": np.uint16,
+    "u32": np.uint32,
+    "i32": np.int32,
+    "f32": np.float32,
+    "f64": np.float64,
+}
+
 TEST_METADATA = {
     SigMFFile.ANNOTATION_KEY: [{SigMFFile.LENGTH_INDEX_KEY: 16, SigMFFile.START_INDEX_KEY: 0}],
     SigMFFile.CAPTURE_KEY: [{SigMFFile.START_INDEX_KEY: 0}],
@@ -24,7 +38,7 @@ TEST_METADATA = {
 }
 
 # Data0 is a test of a compliant two capture recording
-TEST_U8_DATA0 = list(range(256))
+TEST_U8_DATA0 = np.arange(256, dtype=np.uint8)
 TEST_U8_META0 = {
     SigMFFile.ANNOTATION_KEY: [],
     SigMFFile.CAPTURE_KEY: [
@@ -34,7 +48,9 @@ TEST_U8_META0 = {
     SigMFFile.GLOBAL_KEY: {SigMFFile.DATATYPE_KEY: "ru8", SigMFFile.TRAILING_BYTES_KEY: 0},
 }
 # Data1 is a test of a two capture recording with header_bytes and trailing_bytes set
-TEST_U8_DATA1 = [0xFE] * 32 + list(range(192)) + [0xFF] * 32
+TEST_U8_DATA1 = np.concatenate(
+    [np.full(32, 0xFE, dtype=np.uint8), np.arange(192, dtype=np.uint8), np.full(32, 0xFF, dtype=np.uint8)]
+)
 TEST_U8_META1 = {
     SigMFFile.ANNOTATION_KEY: [],
     SigMFFile.CAPTURE_KEY: [
@@ -44,7 +60,15 @@ TEST_U8_META1 = {
     SigMFFile.GLOBAL_KEY: {SigMFFile.DATATYPE_KEY: "ru8", SigMFFile.TRAILING_BYTES_KEY: 32},
 }
 # Data2 is a test of a two capture recording with multiple header_bytes set
-TEST_U8_DATA2 = [0xFE] * 32 + list(range(128)) + [0xFE] * 16 + list(range(128, 192)) + [0xFF] * 16
+TEST_U8_DATA2 = np.concatenate(
+    [
+        np.full(32, 0xFE, dtype=np.uint8),
+        np.arange(128, dtype=np.uint8),
+        np.full(16, 0xFE, dtype=np.uint8),
+        np.arange(128, 192, dtype=np.uint8),
+        np.full(16, 0xFF, dtype=np.uint8),
+    ]
+)
 TEST_U8_META2 = {
     SigMFFile.ANNOTATION_KEY: [],
     SigMFFile.CAPTURE_KEY: [
@@ -54,7 +78,14 @@ TEST_U8_META2 = {
     SigMFFile.GLOBAL_KEY: {SigMFFile.DATATYPE_KEY: "ru8", SigMFFile.TRAILING_BYTES_KEY: 16},
 }
 # Data3 is a test of a three capture recording with multiple header_bytes set
-TEST_U8_DATA3 = [0xFE] * 32 + list(range(128)) + [0xFE] * 32 + list(range(128, 192))
+TEST_U8_DATA3 = np.concatenate(
+    [
+        np.full(32, 0xFE, dtype=np.uint8),
+        np.arange(128, dtype=np.uint8),
+        np.full(32, 0xFE, dtype=np.uint8),
+        np.arange(128, 192, dtype=np.uint8),
+    ]
+)
 TEST_U8_META3 = {
     SigMFFile.ANNOTATION_KEY: [],
     SigMFFile.CAPTURE_KEY: [
@@ -65,7 +96,9 @@ TEST_U8_META3 = {
     SigMFFile.GLOBAL_KEY: {SigMFFile.DATATYPE_KEY: "ru8"},
 }
 # Data4 is a two channel version of Data0
-TEST_U8_DATA4 = [0xFE] * 32 + [y for y in list(range(96)) for i in [0, 1]] + [0xFF] * 32
+TEST_U8_DATA4 = np.concatenate(
+    [np.full(32, 0xFE, dtype=np.uint8), np.repeat(np.arange(96, dtype=np.uint8), 2), np.full(32, 0xFF, dtype=np.uint8)]
+)
 TEST_U8_META4 = {
     SigMFFile.ANNOTATION_KEY: [],
     SigMFFile.CAPTURE_KEY: [